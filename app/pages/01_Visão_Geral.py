@@ -11,8 +11,9 @@ from dotenv import load_dotenv
 from openai import OpenAI
 import json
 
-from src.fultec_api import fetch_abastecimentos, build_filter
-from src.transforms import kpis, por_dia, resumo_por_colaborador
+from src.fultec_api import fetch_abastecimentos_periodos
+from src.transforms import kpis, por_dia, resumo_por_colaborador, comparar_periodos
+from src.utils import comparison_period
 import src.ui_components as ui
 
 # ==================== CONFIGURAÇÕES ====================
@@ -116,27 +117,42 @@ with col2:
     d_fim = st.date_input("Data final", d_fim)
     h_fim = st.time_input("Hora final", h_fim)
 
+comparar = st.selectbox(
+    "Comparar com",
+    ["Nenhum", "Período anterior", "Mesmo período do ano anterior"],
+)
+
 tz = ZoneInfo("America/Sao_Paulo")
 dt_ini = dt.datetime.combine(d_ini, h_ini).replace(tzinfo=tz)
-dt_fim = dt.datetime.combine(d_fim, h_fim).replace(tzinfo=tz)
-
-start_iso = dt_ini.strftime("%Y-%m-%dT%H:%M:%S")
-end_iso   = dt_fim.strftime("%Y-%m-%dT%H:%M:%S")
-
-# Monta filtro da API
-filtro = build_filter(
-    start_iso=start_iso,
-    end_iso=end_iso,
+if h_ini == dt.time(0, 0) and h_fim == dt.time(23, 59):
+    # Dias inteiros: fim exclusivo às 00:00 do dia seguinte (inclui o último minuto
+    # e faz mês cheio / mês até a data compararem com o mês anterior)
+    dt_fim = dt.datetime.combine(d_fim + dt.timedelta(days=1), dt.time(0, 0)).replace(tzinfo=tz)
+else:
+    dt_fim = dt.datetime.combine(d_fim, h_fim).replace(tzinfo=tz)
+
+# Filtros da API (os mesmos para o período atual e o de comparação)
+filtros_api = dict(
     produto=filtros_extras.get("produto"),
     colaborador=filtros_extras.get("colaborador"),
-    nivel=filtros_extras.get("nivel")
+    nivel=filtros_extras.get("nivel"),
 )
 
-@st.cache_data(ttl=120, show_spinner=False)
-def _load(filter_expr: str):
-    return fetch_abastecimentos(filter_expr=filter_expr)
+# Janelas naive (hora local), como as enviadas no $filter. As duas opções passam
+# pelo cache de intervalos: trocar de "Nenhum" para uma comparação só busca o que falta.
+atual = (dt_ini.replace(tzinfo=None), dt_fim.replace(tzinfo=None))
+if atual[0] >= atual[1]:
+    st.warning("⚠️ A data/hora final deve ser posterior à inicial.")
+    st.stop()
 
-df = _load(filtro)
+cmp = None
+if comparar == "Nenhum":
+    df = fetch_abastecimentos_periodos([atual], **filtros_api)
+else:
+    base = comparison_period(*atual, "anterior" if comparar == "Período anterior" else "ano_anterior")
+    df_cmp = fetch_abastecimentos_periodos([atual, base], **filtros_api)
+    cmp = comparar_periodos(df_cmp, {"atual": atual, "anterior": base})
+    df = cmp["atual"]
 
 # ==================== EXECUÇÃO DE AÇÃO ====================
 if acao == "mostrar_kpis":
@@ -155,6 +171,13 @@ elif acao == "mostrar_top_colaboradores":
     top_n = parametros.get("top_n", 10)
     ui.plot_bar_colaboradores(resumo_por_colaborador(df), top_n=top_n)
 
+# ==================== COMPARAÇÃO ENTRE PERÍODOS ====================
+if cmp is not None:
+    st.subheader(f"Comparação: {comparar.lower()}")
+    ui.kpi_row_comparativo(cmp["kpis"])
+    ui.plot_tendencia_comparativa(cmp["por_dia"])
+    st.dataframe(cmp["colaboradores"], use_container_width=True, hide_index=True)
+
 # ==================== SEMPRE MOSTRAR TOP COLABORADORES ====================
 st.subheader("Top Colaboradores (por Valor)")
 top_n = parametros.get("top_n", 10)
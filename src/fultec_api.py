@@ -1,10 +1,14 @@
-from typing import Optional, Dict, List
+import time
+import threading
+import datetime as dt
+from typing import Optional, Dict, List, Tuple
 import requests
 import pandas as pd
 from urllib.parse import urlencode
 
 from .config import FULTec_BASE_URL, FULTec_TIMEOUT, DEFAULT_SELECT
 from .auth import auth_header, refresh_and_get
+from .utils import merge_ranges, missing_ranges
 
 _SESSION = requests.Session()
 
@@ -170,3 +174,106 @@ def fetch_abastecimentos(
             df[c] = pd.Series(dtype="float64")
 
     return df
+
+
+# --------------------------------------------
+# Fetch por intervalos com cache de sobreposição
+# --------------------------------------------
+_ISO_FMT = "%Y-%m-%dT%H:%M:%S"
+_RANGE_CACHE: Dict[tuple, dict] = {}
+_RANGE_CACHE_TTL = 120  # segundos, igual ao st.cache_data da página
+# Compartilhado entre as sessões (threads) do Streamlit
+_RANGE_CACHE_LOCK = threading.Lock()
+
+
+def _prune_range_cache(now: float) -> None:
+    """Remove entradas expiradas (chamar com _RANGE_CACHE_LOCK adquirido)."""
+    for key in [k for k, e in _RANGE_CACHE.items() if now - e["ts"] > _RANGE_CACHE_TTL]:
+        del _RANGE_CACHE[key]
+
+
+def _slice_periodo(df: pd.DataFrame, ini: dt.datetime, fim: dt.datetime) -> pd.DataFrame:
+    """Linhas com dhRegistro em [ini, fim) (fuso descartado dos dois lados)."""
+    if df.empty or "dhRegistro" not in df.columns:
+        return df.iloc[0:0].copy()
+    dh = df["dhRegistro"]
+    if dh.dt.tz is not None:
+        dh = dh.dt.tz_localize(None)
+    t_ini, t_fim = pd.Timestamp(ini), pd.Timestamp(fim)
+    if t_ini.tzinfo is not None:
+        t_ini, t_fim = t_ini.tz_localize(None), t_fim.tz_localize(None)
+    return df[(dh >= t_ini) & (dh < t_fim)].copy()
+
+
+def _concat_ordenado(partes: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatena e ordena por dhRegistro (convertido para datetime)."""
+    df = pd.concat(partes, ignore_index=True)
+    df["dhRegistro"] = pd.to_datetime(df["dhRegistro"], errors="coerce")
+    return df.sort_values("dhRegistro", kind="stable").reset_index(drop=True)
+
+
+def fetch_abastecimentos_periodos(
+    periodos: List[Tuple[dt.datetime, dt.datetime]],
+    produto: Optional[str] = None,
+    colaborador: Optional[str] = None,
+    nivel: Optional[str] = None,
+    select: Optional[str] = DEFAULT_SELECT,
+    timeout: float = FULTec_TIMEOUT,
+) -> pd.DataFrame:
+    """
+    Busca os abastecimentos que cobrem todos os 'periodos' ([ini, fim), naive).
+    Reaproveita trechos já buscados com os mesmos filtros e consulta a API só
+    para os intervalos faltantes; períodos contíguos viram uma única busca alargada.
+    Retorna a união das linhas dos períodos pedidos, ordenada por dhRegistro.
+    Se alguma busca falhar, o cache não é alterado e o erro é propagado.
+    """
+    janelas = merge_ranges(periodos)
+    if not janelas:
+        raise ValueError("Informe ao menos um período com início anterior ao fim.")
+
+    key = (select, produto or "", colaborador or "", nivel or "")
+
+    # O lock protege só a leitura e a escrita do cache; as buscas na API rodam
+    # fora dele para uma sessão lenta não travar as demais.
+    with _RANGE_CACHE_LOCK:
+        now = time.monotonic()
+        _prune_range_cache(now)
+        snap = _RANGE_CACHE.get(key) or {"ts": now, "ranges": [], "df": None}
+
+    faltando = missing_ranges(janelas, snap["ranges"])
+    novos = []
+    for ini, fim in faltando:
+        filtro = build_filter(
+            start_iso=ini.strftime(_ISO_FMT),
+            end_iso=fim.strftime(_ISO_FMT),
+            produto=produto,
+            colaborador=colaborador,
+            nivel=nivel,
+        )
+        novos.append(fetch_abastecimentos(select=select, filter_expr=filtro, timeout=timeout))
+
+    partes = [snap["df"]] if snap["df"] is not None else []
+    if novos:
+        novo_df = _concat_ordenado(novos)
+        partes.append(novo_df)
+        # Só chega aqui se todas as buscas deram certo: intervalos e linhas juntos.
+        # Outra sessão pode ter preenchido parte dos mesmos intervalos enquanto
+        # buscávamos; grava apenas o que ainda falta na entrada atual.
+        with _RANGE_CACHE_LOCK:
+            _prune_range_cache(time.monotonic())
+            entry = _RANGE_CACHE.get(key) or {"ts": snap["ts"], "ranges": [], "df": None}
+            ainda = missing_ranges(faltando, entry["ranges"])
+            if ainda:
+                add = [_slice_periodo(novo_df, ini, fim) for ini, fim in ainda]
+                base = [entry["df"]] if entry["df"] is not None else []
+                _RANGE_CACHE[key] = {
+                    "ts": entry["ts"],
+                    "ranges": merge_ranges(entry["ranges"] + ainda),
+                    "df": _concat_ordenado(base + add),
+                }
+
+    fonte = _concat_ordenado(partes) if novos else snap["df"]
+    return pd.concat(
+        [_slice_periodo(fonte, ini, fim) for ini, fim in janelas],
+        ignore_index=True,
+    )
@@ -84,3 +84,189 @@ def resumo_por_colaborador(df: pd.DataFrame) -> pd.DataFrame:
         .sort_values("Valor", ascending=False)
     )
     return resumo
+
+
+# ----------------- Comparação entre períodos -----------------
+def _naive_ts(x) -> pd.Timestamp:
+    ts = pd.Timestamp(x)
+    return ts.tz_localize(None) if ts.tzinfo is not None else ts
+
+def _col_num(work: pd.DataFrame, col: str) -> pd.Series:
+    if col in work.columns:
+        return _num(work[col])
+    return pd.Series(float("nan"), index=work.index, dtype="float64")
+
+def _com_deltas(df: pd.DataFrame, col_atual: str, col_base: str) -> pd.DataFrame:
+    """Acrescenta 'Delta' (atual - base) e 'Delta %' (NaN quando base = 0)."""
+    df["Delta"] = df[col_atual] - df[col_base]
+    base = df[col_base].where(df[col_base] != 0)
+    df["Delta %"] = df["Delta"] / base * 100
+    return df
+
+def rotular_periodos(df: pd.DataFrame, periodos: dict) -> pd.DataFrame:
+    """
+    Marca cada linha com o rótulo do período a que pertence.
+    'periodos' = {rotulo: (ini, fim)}, janelas semiabertas [ini, fim) sobre 'dhRegistro'.
+    Acrescenta 'periodo' e 'dia_rel' (dias desde o início do período, para alinhar
+    os períodos dia a dia). Linhas fora de todas as janelas são descartadas.
+    """
+    cols = list(df.columns) + ["periodo", "dia_rel"]
+    if df.empty or "dhRegistro" not in df.columns:
+        return pd.DataFrame(columns=cols)
+
+    dh = pd.to_datetime(df["dhRegistro"], errors="coerce")
+    if dh.dt.tz is not None:
+        dh = dh.dt.tz_localize(None)
+
+    partes = []
+    for rotulo, (ini, fim) in periodos.items():
+        t_ini, t_fim = _naive_ts(ini), _naive_ts(fim)
+        mask = (dh >= t_ini) & (dh < t_fim)
+        parte = df[mask].copy()
+        parte["periodo"] = rotulo
+        parte["dia_rel"] = (dh[mask].dt.normalize() - t_ini.normalize()).dt.days
+        partes.append(parte)
+
+    if not partes:
+        return pd.DataFrame(columns=cols)
+    return pd.concat(partes, ignore_index=True)
+
+def kpis_comparativo(df_rot: pd.DataFrame, atual: str = "atual", base: str = "anterior") -> pd.DataFrame:
+    """
+    KPIs dos dois períodos numa única agregação agrupada por 'periodo'.
+    Retorna colunas: ['Métrica', atual, base, 'Delta', 'Delta %'],
+    com as métricas Abastecimentos, Litragem, Faturamento e Ticket médio.
+    """
+    work = pd.DataFrame({
+        "periodo": df_rot["periodo"] if "periodo" in df_rot.columns else pd.Series(dtype="object"),
+        "Litragem": _col_num(df_rot, "litragem"),
+        "Faturamento": _col_num(df_rot, "valor"),
+    })
+
+    por_periodo = (
+        work.groupby("periodo")
+        .agg(
+            Abastecimentos=("Faturamento", "size"),
+            Litragem=("Litragem", "sum"),
+            Faturamento=("Faturamento", "sum"),
+        )
+        .astype("float64")
+        .reindex([atual, base], fill_value=0.0)
+    )
+    abast = por_periodo["Abastecimentos"]
+    por_periodo["Ticket médio"] = (por_periodo["Faturamento"] / abast.where(abast > 0)).fillna(0.0)
+
+    res = por_periodo.T.rename_axis("Métrica").reset_index()
+    res.columns.name = None
+    return _com_deltas(res, atual, base)
+
+def por_dia_comparativo(
+    df_rot: pd.DataFrame,
+    atual: str = "atual",
+    base: str = "anterior",
+    inicio_atual=None,
+) -> pd.DataFrame:
+    """
+    Valor e Litragem por dia dos dois períodos, alinhados por 'dia_rel'.
+    'dia' é a data no período atual (requer 'inicio_atual'; senão repete 'dia_rel').
+    Retorna colunas: ['dia_rel', 'dia', 'Valor', 'Litragem',
+    'Valor anterior', 'Litragem anterior', 'Delta Valor', 'Delta Litragem'].
+    """
+    cols = ["dia_rel", "dia", "Valor", "Litragem",
+            "Valor anterior", "Litragem anterior", "Delta Valor", "Delta Litragem"]
+    if df_rot.empty or "periodo" not in df_rot.columns:
+        return pd.DataFrame(columns=cols)
+
+    work = pd.DataFrame({
+        "periodo": df_rot["periodo"],
+        "dia_rel": df_rot["dia_rel"],
+        "Valor": _col_num(df_rot, "valor"),
+        "Litragem": _col_num(df_rot, "litragem"),
+    })
+
+    metricas = ["Valor", "Litragem"]
+    largo = (
+        work.groupby(["periodo", "dia_rel"])[metricas]
+        .sum()
+        .unstack("periodo", fill_value=0.0)
+        .reindex(columns=pd.MultiIndex.from_product([metricas, [atual, base]]), fill_value=0.0)
+        .sort_index()
+    )
+
+    out = pd.DataFrame({"dia_rel": largo.index.astype("int64")})
+    if inicio_atual is not None:
+        inicio = _naive_ts(inicio_atual).normalize()
+        out["dia"] = (inicio + pd.to_timedelta(out["dia_rel"], unit="D")).dt.date
+    else:
+        out["dia"] = out["dia_rel"]
+    for m in metricas:
+        out[m] = largo[(m, atual)].to_numpy()
+        out[f"{m} anterior"] = largo[(m, base)].to_numpy()
+        out[f"Delta {m}"] = out[m] - out[f"{m} anterior"]
+    return out[cols]
+
+def resumo_por_colaborador_comparativo(
+    df_rot: pd.DataFrame,
+    atual: str = "atual",
+    base: str = "anterior",
+) -> pd.DataFrame:
+    """
+    Faturamento por colaborador nos dois períodos, numa agregação por (periodo, colaborador).
+    Usa 'nomeFuncionario' (ou 'nomeVendedor' como fallback).
+    Retorna colunas: ['Colaborador', 'Valor', 'Valor anterior', 'Delta', 'Delta %']
+    ordenado por Valor desc.
+    """
+    cols = ["Colaborador", "Valor", "Valor anterior", "Delta", "Delta %"]
+    if df_rot.empty or "periodo" not in df_rot.columns:
+        return pd.DataFrame(columns=cols)
+
+    if "nomeFuncionario" in df_rot.columns:
+        col_nome = "nomeFuncionario"
+    elif "nomeVendedor" in df_rot.columns:
+        col_nome = "nomeVendedor"
+    else:
+        return pd.DataFrame(columns=cols)
+
+    work = pd.DataFrame({
+        "periodo": df_rot["periodo"],
+        "Colaborador": df_rot[col_nome],
+        "Valor": _col_num(df_rot, "valor"),
+    })
+
+    largo = (
+        work.groupby(["Colaborador", "periodo"], dropna=False)["Valor"]
+        .sum()
+        .unstack("periodo", fill_value=0.0)
+        .reindex(columns=[atual, base], fill_value=0.0)
+    )
+    largo.columns.name = None
+    resumo = (
+        largo.rename(columns={atual: "Valor", base: "Valor anterior"})
+        .reset_index()
+    )
+    resumo = _com_deltas(resumo, "Valor", "Valor anterior")
+    return resumo.sort_values("Valor", ascending=False)[cols]
+
+def comparar_periodos(
+    df: pd.DataFrame,
+    periodos: dict,
+    atual: str = "atual",
+    base: str = "anterior",
+) -> dict:
+    """
+    Rotula 'df' uma única vez e calcula os comparativos dos dois períodos.
+    Retorna {'atual': ..., 'kpis': ..., 'por_dia': ..., 'colaboradores': ...},
+    onde 'atual' são as linhas do período atual (sem as colunas de rótulo).
+    """
+    df_rot = rotular_periodos(df, periodos)
+    linhas_atual = (
+        df_rot[df_rot["periodo"] == atual]
+        .drop(columns=["periodo", "dia_rel"])
+        .reset_index(drop=True)
+    )
+    return {
+        "atual": linhas_atual,
+        "kpis": kpis_comparativo(df_rot, atual, base),
+        "por_dia": por_dia_comparativo(df_rot, atual, base, inicio_atual=periodos[atual][0]),
+        "colaboradores": resumo_por_colaborador_comparativo(df_rot, atual, base),
+    }
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import streamlit as st
 import plotly.express as px
 import pandas as pd
@@ -31,6 +33,26 @@ def kpi_row(k):
     c4.metric("Ticket médio (R$)", _fmt_br_currency(ticket_medio))
 
 
+def _fmt_delta_pct(pct) -> Optional[str]:
+    if pct is None or pd.isna(pct):
+        return None
+    return f"{_fmt_br_number(pct, 1)}%"
+
+
+def kpi_row_comparativo(k_cmp: pd.DataFrame, atual: str = "atual"):
+    """Exibe KPIs do período atual com a variação % sobre o período de comparação."""
+    linhas = k_cmp.set_index("Métrica")
+    fmt = {
+        "Abastecimentos": ("Abastecimentos", lambda v: _fmt_br_number(v, 0)),
+        "Litragem": ("Litragem (L)", lambda v: _fmt_br_number(v, 2)),
+        "Faturamento": ("Faturamento (R$)", _fmt_br_currency),
+        "Ticket médio": ("Ticket médio (R$)", _fmt_br_currency),
+    }
+    for col, (metrica, (rotulo, f)) in zip(st.columns(4), fmt.items()):
+        col.metric(rotulo, f(linhas.at[metrica, atual]),
+                   delta=_fmt_delta_pct(linhas.at[metrica, "Delta %"]))
+
+
 # ---------- Tendência diária ----------
 def _has_trend_cols(df: pd.DataFrame) -> bool:
     return {"dia", "Valor", "Litragem"}.issubset(df.columns)
@@ -98,6 +120,22 @@ def plot_tendencia(df: pd.DataFrame, mode: str):
     return plot_tendencia_barras(df)
 
 
+def plot_tendencia_comparativa(df: pd.DataFrame):
+    """Valor diário do período atual contra o de comparação, alinhados por dia."""
+    if not {"dia", "Valor", "Valor anterior"}.issubset(df.columns) or df.empty:
+        st.info("Dados insuficientes para comparar a tendência diária.")
+        return
+    df_long = df.rename(columns={"Valor": "Atual", "Valor anterior": "Comparação"}).melt(
+        id_vars=["dia"], value_vars=["Atual", "Comparação"],
+        var_name="Período", value_name="vl")
+    fig = px.line(df_long, x="dia", y="vl", color="Período", markers=True,
+                  labels={"dia": "Data", "vl": "Valor (R$)", "Período": "Período"},
+                  hover_data={"vl": ":,.2f"})
+    fig.update_layout(hovermode="x unified", legend_title="Período",
+                      margin=dict(l=10, r=10, t=10, b=10))
+    st.plotly_chart(fig, use_container_width=True)
+
+
 # ---------- Top colaboradores ----------
 def plot_bar_colaboradores(resumo: pd.DataFrame, top_n: int = 10):
     if resumo.empty:
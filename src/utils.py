@@ -10,3 +10,94 @@ def month_bounds(date: dt.date):
     else:
         next_m = first.replace(month=first.month+1, day=1)
     return first, next_m
+
+
+# ----------------- Períodos de comparação -----------------
+def _shift_year(d: dt.datetime, years: int) -> dt.datetime:
+    """Desloca 'd' em N anos; 29/02 vira 28/02 em anos não bissextos."""
+    try:
+        return d.replace(year=d.year + years)
+    except ValueError:
+        return d.replace(year=d.year + years, day=28)
+
+
+def _starts_month(start: dt.datetime, end: dt.datetime) -> bool:
+    """Janela começa no dia 1 às 00:00 e não passa do início do mês seguinte."""
+    first, next_m = month_bounds(start.date())
+    return (
+        start == dt.datetime.combine(first, dt.time(0, 0), tzinfo=start.tzinfo)
+        and end <= dt.datetime.combine(next_m, dt.time(0, 0), tzinfo=end.tzinfo)
+    )
+
+
+def previous_period(start: dt.datetime, end: dt.datetime):
+    """
+    Período imediatamente anterior a [start, end).
+    Se a janela começar no dia 1 (mês cheio ou mês até a data), devolve o
+    trecho equivalente do mês anterior (MoM), limitado ao mês inteiro;
+    senão, uma janela de mesma duração terminando em 'start'.
+    """
+    if _starts_month(start, end):
+        prev_first, _ = month_bounds(start.date() - dt.timedelta(days=1))
+        prev_start = dt.datetime.combine(prev_first, dt.time(0, 0), tzinfo=start.tzinfo)
+        try:
+            prev_end = end.replace(year=prev_start.year, month=prev_start.month)
+        except ValueError:
+            # Dia inexistente no mês anterior (ex.: 31/03 -> 31/02): mês anterior inteiro
+            prev_end = start
+        if end.day == 1 and end.time() == dt.time(0, 0) and end > start:
+            # Fim exclusivo em 00:00 do mês seguinte: mês cheio
+            prev_end = start
+        return prev_start, min(prev_end, start)
+    return start - (end - start), start
+
+
+def same_period_last_year(start: dt.datetime, end: dt.datetime):
+    """Mesma janela [start, end) deslocada um ano para trás (YoY)."""
+    return _shift_year(start, -1), _shift_year(end, -1)
+
+
+def comparison_period(start: dt.datetime, end: dt.datetime, modo: str):
+    """
+    Resolve a janela de comparação para 'modo':
+    'anterior' (período anterior) ou 'ano_anterior' (mesmo período do ano anterior).
+    """
+    if modo == "anterior":
+        return previous_period(start, end)
+    if modo == "ano_anterior":
+        return same_period_last_year(start, end)
+    raise ValueError(f"Modo de comparação desconhecido: {modo!r}")
+
+
+# ----------------- Intervalos [ini, fim) -----------------
+def merge_ranges(ranges):
+    """Une intervalos semiabertos sobrepostos ou contíguos; devolve lista ordenada."""
+    merged = []
+    for ini, fim in sorted(r for r in ranges if r[0] < r[1]):
+        if merged and ini <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], fim))
+        else:
+            merged.append((ini, fim))
+    return merged
+
+
+def missing_ranges(wanted, cached):
+    """
+    Trechos de 'wanted' (lista de intervalos) ainda não cobertos por 'cached'.
+    Intervalos de 'wanted' contíguos são unidos, gerando uma única busca alargada.
+    """
+    faltando = []
+    cobertos = merge_ranges(cached)
+    for ini, fim in merge_ranges(wanted):
+        cursor = ini
+        for c_ini, c_fim in cobertos:
+            if c_fim <= cursor or c_ini >= fim:
+                continue
+            if c_ini > cursor:
+                faltando.append((cursor, c_ini))
+            cursor = max(cursor, c_fim)
+            if cursor >= fim:
+                break
+        if cursor < fim:
+            faltando.append((cursor, fim))
+    return faltando
@@ -0,0 +1,10 @@
+# --- garantir que o pacote "src" seja encontrado ---
+import os
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+# src.auth lê as credenciais na importação; os testes não acessam a API
+os.environ.setdefault("FULTec_USER", "teste")
+os.environ.setdefault("FULTec_PASS", "teste")
+os.environ.setdefault("FULTec_CNPJ", "00000000000000")
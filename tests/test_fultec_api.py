@@ -0,0 +1,120 @@
+import datetime as dt
+import threading
+
+import pandas as pd
+import pytest
+
+import src.fultec_api as api
+
+D = dt.datetime
+JAN_23 = (D(2023, 1, 1), D(2023, 2, 1))
+JAN_24 = (D(2024, 1, 1), D(2024, 2, 1))
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpo():
+    api._RANGE_CACHE.clear()
+    yield
+    api._RANGE_CACHE.clear()
+
+
+def _linha_do_filtro(filter_expr):
+    ano = int(filter_expr.split("dhRegistro ge ")[1][:4])
+    return pd.DataFrame({"dhRegistro": [pd.Timestamp(ano, 1, 10)], "valor": [float(ano)]})
+
+
+def test_busca_apenas_intervalos_faltantes(monkeypatch):
+    chamadas = []
+
+    def fake(select=None, filter_expr=None, timeout=None):
+        chamadas.append(filter_expr)
+        return _linha_do_filtro(filter_expr)
+
+    monkeypatch.setattr(api, "fetch_abastecimentos", fake)
+    api.fetch_abastecimentos_periodos([JAN_24])
+    df = api.fetch_abastecimentos_periodos([JAN_23, JAN_24])
+    assert len(chamadas) == 2
+    assert sorted(df["valor"]) == [2023.0, 2024.0]
+
+
+def test_falha_nao_marca_intervalos_como_cobertos(monkeypatch):
+    chamadas = []
+
+    def fake(select=None, filter_expr=None, timeout=None):
+        chamadas.append(filter_expr)
+        if len(chamadas) == 2:
+            raise TimeoutError("api fora")
+        return _linha_do_filtro(filter_expr)
+
+    monkeypatch.setattr(api, "fetch_abastecimentos", fake)
+    with pytest.raises(TimeoutError):
+        api.fetch_abastecimentos_periodos([JAN_23, JAN_24])
+
+    df = api.fetch_abastecimentos_periodos([JAN_23, JAN_24])
+    assert sorted(df["valor"]) == [2023.0, 2024.0]
+
+
+def test_entradas_expiradas_sao_removidas(monkeypatch):
+    monkeypatch.setattr(api, "fetch_abastecimentos", lambda **kw: _linha_do_filtro(kw["filter_expr"]))
+    api.fetch_abastecimentos_periodos([JAN_23], produto="diesel")
+    api._RANGE_CACHE[(api.DEFAULT_SELECT, "diesel", "", "")]["ts"] -= api._RANGE_CACHE_TTL + 1
+    api.fetch_abastecimentos_periodos([JAN_23], produto="gasolina")
+    assert list(api._RANGE_CACHE) == [(api.DEFAULT_SELECT, "gasolina", "", "")]
+
+
+def test_periodo_invertido_ou_vazio_gera_erro_sem_buscar(monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(api, "fetch_abastecimentos", lambda **kw: chamadas.append(kw))
+    with pytest.raises(ValueError):
+        api.fetch_abastecimentos_periodos([(D(2024, 2, 1), D(2024, 1, 1))])
+    with pytest.raises(ValueError):
+        api.fetch_abastecimentos_periodos([(D(2024, 1, 1), D(2024, 1, 1))])
+    assert chamadas == []
+
+
+def test_busca_lenta_nao_bloqueia_outros_filtros(monkeypatch):
+    liberar, dentro = threading.Event(), threading.Event()
+
+    def fake(select=None, filter_expr=None, timeout=None):
+        if "diesel" in filter_expr:
+            dentro.set()
+            assert liberar.wait(5)
+        return _linha_do_filtro(filter_expr)
+
+    monkeypatch.setattr(api, "fetch_abastecimentos", fake)
+    lenta = threading.Thread(target=api.fetch_abastecimentos_periodos, args=([JAN_23],),
+                             kwargs={"produto": "diesel"})
+    lenta.start()
+    assert dentro.wait(5)
+    try:
+        resultado = []
+        rapida = threading.Thread(target=lambda: resultado.append(
+            api.fetch_abastecimentos_periodos([JAN_24], produto="gasolina")))
+        rapida.start()
+        rapida.join(2)
+        assert not rapida.is_alive()
+        assert resultado[0]["valor"].tolist() == [2024.0]
+    finally:
+        liberar.set()
+        lenta.join(5)
+
+
+def test_preenchimento_concorrente_nao_duplica_linhas(monkeypatch):
+    chamadas = []
+
+    def fake(select=None, filter_expr=None, timeout=None):
+        chamadas.append(filter_expr)
+        if len(chamadas) == 1:
+            # Outra sessão preenche o mesmo intervalo enquanto esta busca
+            outra = threading.Thread(target=api.fetch_abastecimentos_periodos, args=([JAN_23],))
+            outra.start()
+            outra.join(2)
+            assert not outra.is_alive()
+        return _linha_do_filtro(filter_expr)
+
+    monkeypatch.setattr(api, "fetch_abastecimentos", fake)
+    df = api.fetch_abastecimentos_periodos([JAN_23])
+    assert df["valor"].tolist() == [2023.0]
+    entry = api._RANGE_CACHE[(api.DEFAULT_SELECT, "", "", "")]
+    assert entry["ranges"] == [JAN_23]
+    assert entry["df"]["valor"].tolist() == [2023.0]
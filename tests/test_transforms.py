@@ -0,0 +1,83 @@
+import datetime as dt
+
+import pandas as pd
+
+from src.transforms import (
+    comparar_periodos, kpis_comparativo, por_dia_comparativo,
+    resumo_por_colaborador_comparativo, rotular_periodos,
+)
+
+D = dt.datetime
+PERIODOS = {
+    "atual": (D(2025, 3, 1), D(2025, 3, 3)),
+    "anterior": (D(2025, 2, 1), D(2025, 2, 3)),
+}
+
+
+def _df(linhas):
+    return pd.DataFrame(linhas, columns=["dhRegistro", "valor", "litragem", "nomeFuncionario"])
+
+
+def _base():
+    return _df([
+        (D(2025, 3, 1, 8), 100.0, 20.0, "Ana"),
+        (D(2025, 3, 2, 9), 50.0, 10.0, "Bia"),
+        (D(2025, 2, 1, 7), 80.0, 16.0, "Ana"),
+        (D(2025, 1, 15, 7), 999.0, 99.0, "Ana"),  # fora das janelas
+        (D(2025, 3, 3, 0), 999.0, 99.0, "Ana"),   # fim é exclusivo
+    ])
+
+
+def test_rotular_periodos():
+    rot = rotular_periodos(_base(), PERIODOS)
+    assert sorted(rot["periodo"]) == ["anterior", "atual", "atual"]
+    assert rot.loc[rot["periodo"] == "atual", "dia_rel"].tolist() == [0, 1]
+
+
+def test_kpis_comparativo():
+    k = kpis_comparativo(rotular_periodos(_base(), PERIODOS)).set_index("Métrica")
+    assert k.at["Abastecimentos", "atual"] == 2
+    assert k.at["Faturamento", "anterior"] == 80.0
+    assert k.at["Faturamento", "Delta"] == 70.0
+    assert k.at["Faturamento", "Delta %"] == 87.5
+    assert k.at["Ticket médio", "atual"] == 75.0
+
+
+def test_kpis_comparativo_base_sem_linhas():
+    df = _base()
+    df = df[df["dhRegistro"] >= D(2025, 3, 1)]
+    k = kpis_comparativo(rotular_periodos(df, PERIODOS)).set_index("Métrica")
+    assert k.at["Abastecimentos", "anterior"] == 0
+    assert k.at["Ticket médio", "anterior"] == 0
+    assert k.at["Faturamento", "Delta"] == 150.0
+    assert pd.isna(k.at["Faturamento", "Delta %"])
+
+
+def test_por_dia_comparativo_alinha_dias():
+    out = por_dia_comparativo(rotular_periodos(_base(), PERIODOS), inicio_atual=D(2025, 3, 1))
+    assert out["dia"].tolist() == [dt.date(2025, 3, 1), dt.date(2025, 3, 2)]
+    assert out["Valor"].tolist() == [100.0, 50.0]
+    assert out["Valor anterior"].tolist() == [80.0, 0.0]
+    assert out["Delta Litragem"].tolist() == [4.0, 10.0]
+
+
+def test_resumo_por_colaborador_comparativo():
+    out = resumo_por_colaborador_comparativo(rotular_periodos(_base(), PERIODOS)).set_index("Colaborador")
+    assert out.index.tolist() == ["Ana", "Bia"]
+    assert out.at["Ana", "Delta %"] == 25.0
+    assert out.at["Bia", "Valor anterior"] == 0.0
+    assert pd.isna(out.at["Bia", "Delta %"])
+
+
+def test_comparar_periodos_vazio():
+    res = comparar_periodos(_df([]), PERIODOS)
+    assert res["atual"].empty
+    assert res["por_dia"].empty
+    assert res["colaboradores"].empty
+    assert res["kpis"]["atual"].tolist() == [0.0, 0.0, 0.0, 0.0]
+
+
+def test_comparar_periodos_linhas_do_atual():
+    res = comparar_periodos(_base(), PERIODOS)
+    assert res["atual"]["valor"].tolist() == [100.0, 50.0]
+    assert "periodo" not in res["atual"].columns
@@ -0,0 +1,69 @@
+import datetime as dt
+
+from src.utils import (
+    merge_ranges, missing_ranges, previous_period, same_period_last_year,
+)
+
+D = dt.datetime
+
+
+# ----------------- Intervalos -----------------
+def test_merge_ranges_une_sobrepostos_e_contiguos():
+    r = [(D(2025, 3, 10), D(2025, 3, 20)), (D(2025, 3, 1), D(2025, 3, 10)),
+         (D(2025, 3, 15), D(2025, 3, 25)), (D(2025, 4, 1), D(2025, 4, 2))]
+    assert merge_ranges(r) == [(D(2025, 3, 1), D(2025, 3, 25)), (D(2025, 4, 1), D(2025, 4, 2))]
+
+
+def test_merge_ranges_descarta_vazios():
+    assert merge_ranges([(D(2025, 3, 2), D(2025, 3, 2)), (D(2025, 3, 5), D(2025, 3, 1))]) == []
+
+
+def test_missing_ranges_contiguos_viram_uma_busca():
+    atual = (D(2025, 3, 1), D(2025, 4, 1))
+    anterior = (D(2025, 2, 1), D(2025, 3, 1))
+    assert missing_ranges([atual, anterior], []) == [(D(2025, 2, 1), D(2025, 4, 1))]
+
+
+def test_missing_ranges_sobreposicao_parcial():
+    wanted = [(D(2025, 3, 1), D(2025, 4, 1))]
+    cached = [(D(2025, 2, 20), D(2025, 3, 5)), (D(2025, 3, 10), D(2025, 3, 15))]
+    assert missing_ranges(wanted, cached) == [
+        (D(2025, 3, 5), D(2025, 3, 10)),
+        (D(2025, 3, 15), D(2025, 4, 1)),
+    ]
+
+
+def test_missing_ranges_totalmente_coberto():
+    assert missing_ranges([(D(2025, 3, 5), D(2025, 3, 6))], [(D(2025, 3, 1), D(2025, 4, 1))]) == []
+
+
+def test_missing_ranges_nao_contiguos_ficam_separados():
+    a = (D(2025, 3, 1), D(2025, 4, 1))
+    b = (D(2024, 3, 1), D(2024, 4, 1))
+    assert missing_ranges([a, b], [a]) == [b]
+
+
+# ----------------- Períodos de comparação -----------------
+def test_previous_period_mes_cheio():
+    assert previous_period(D(2025, 3, 1), D(2025, 4, 1)) == (D(2025, 2, 1), D(2025, 3, 1))
+
+
+def test_previous_period_mes_cheio_na_virada_de_ano():
+    assert previous_period(D(2025, 1, 1), D(2025, 2, 1)) == (D(2024, 12, 1), D(2025, 1, 1))
+
+
+def test_previous_period_mes_ate_a_data():
+    assert previous_period(D(2025, 3, 1), D(2025, 3, 20)) == (D(2025, 2, 1), D(2025, 2, 20))
+
+
+def test_previous_period_mes_ate_a_data_limitado_ao_mes_anterior():
+    # 31/02 não existe: compara com fevereiro inteiro
+    assert previous_period(D(2025, 3, 1), D(2025, 3, 31)) == (D(2025, 2, 1), D(2025, 3, 1))
+
+
+def test_previous_period_janela_qualquer_mesma_duracao():
+    assert previous_period(D(2025, 3, 10), D(2025, 3, 20)) == (D(2025, 2, 28), D(2025, 3, 10))
+
+
+def test_same_period_last_year_29_de_fevereiro():
+    assert same_period_last_year(D(2024, 2, 29), D(2024, 3, 1)) == (D(2023, 2, 28), D(2023, 3, 1))